@@ -1,14 +1,27 @@
+import io
 import re
 import string
+import numpy as np
 import pandas as pd
 
-from typing import List, Tuple
+from collections import Counter
+from typing import Any, Collection, Generator, Iterable, Iterator, List, Optional, Set, Tuple
 from sklearn.feature_extraction.text import CountVectorizer
 
 from bionic_reading.data import stopwords_set
-from bionic_reading.settings import RareBehavior, Format, Colors
+from bionic_reading.features.frequency_sketch import CountMinSketch
+from bionic_reading.settings import RareBehavior, Format, Colors, RareWordsScope, FixationMode
 from bionic_reading.utils.file_utils import string_contains_digit, strike_string
-from bionic_reading.settings import SIMPLE_SPLITTER, OutputFormat, StopWordsBehavior
+from bionic_reading.utils.fixation_utils import fixation_split
+from bionic_reading.utils.memory_utils import MemoryProfiler
+from bionic_reading.utils.span_utils import Span, spans_to_json
+from bionic_reading.settings import SIMPLE_SPLITTER, MEMORY_PER_CHAR, LOW_MEMORY_CHUNK_SIZE, FIXATION_TABLE_SIZE
+from bionic_reading.settings import OutputFormat, StopWordsBehavior
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover
+    pa = None
 
 
 class BionicReading:
@@ -24,7 +37,9 @@ class BionicReading:
         output_format: str = OutputFormat.HTML.value,
         rare_words_behavior: str = RareBehavior.UNDERLINE.value,
         rare_words_max_freq: int = 5,
-        highlight_color: str = Colors.RED.value
+        highlight_color: str = Colors.RED.value,
+        max_memory: Optional[int] = None,
+        fixation_mode: str = FixationMode.CHARS.value,
     ):
         """
         Inits BionicReading
@@ -39,7 +54,7 @@ class BionicReading:
         :type stopwords: float
         :param stopwords_behavior: Change the way the stopwords are handled (remove, ignore, keep)
         :type stopwords_behavior: str
-        :param output_format: The format of the output (html, python)
+        :param output_format: The format of the output (html, python, spans)
         :type output_format: str
         :param rare_words_behavior: Change the way the rare words are handled (highlight, underline)
         :type rare_words_behavior: str
@@ -47,6 +62,10 @@ class BionicReading:
         :type rare_words_max_freq: int
         :param highlight_color: Color that highlight the text
         :type highlight_color: str
+        :param max_memory: Memory budget in bytes, above it the text is processed with a lower-memory strategy
+        :type max_memory: int (optional)
+        :param fixation_mode: Split the words on chars, graphemes or syllables (chars, graphemes, syllables)
+        :type fixation_mode: str
         """
         self.fixation = fixation
         self.saccades = saccades
@@ -57,6 +76,8 @@ class BionicReading:
         self.rare_words_behavior = rare_words_behavior
         self.rare_words_max_freq = rare_words_max_freq
         self.highlight_color = highlight_color
+        self.max_memory = max_memory
+        self.fixation_mode = fixation_mode
         self.non_tokens = string.punctuation + " \n\t"
 
     @property
@@ -79,6 +100,7 @@ class BionicReading:
         assert isinstance(value, float), "please use a fixation float type"
         assert 0 <= value <= 1, "please enter a fixation value between 0 and 1"
         self._fixation = value
+        self._fixation_table = [0, 1, 1] + [round(value * length) for length in range(3, FIXATION_TABLE_SIZE)]
 
     @fixation.deleter
     def fixation(self):
@@ -86,6 +108,38 @@ class BionicReading:
         It deletes the fixation attribute of the object.
         """
         del self._fixation
+        del self._fixation_table
+
+    @property
+    def fixation_mode(self):
+        """
+        It returns the way the words are split by the fixation.
+        :return: The fixation_mode is being returned.
+        """
+        return self._fixation_mode
+
+    @fixation_mode.setter
+    def fixation_mode(self, value: str):
+        """
+        The function takes in a string value and checks if it is a valid fixation mode. If it is, it sets the fixation
+        mode to that value
+
+        :param value: the value of the parameter
+        :type value: str
+        """
+        possible_values = [mode.value.lower() for mode in FixationMode]
+        assert isinstance(value, str), "please use a fixation_mode str type"
+        assert value in possible_values, f"please enter a fixation_mode within {possible_values}"
+        self._fixation_mode = value
+        self._chars_fixation = value == FixationMode.CHARS.value
+
+    @fixation_mode.deleter
+    def fixation_mode(self):
+        """
+        It deletes the fixation_mode attribute from the object.
+        """
+        del self._fixation_mode
+        del self._chars_fixation
 
     @property
     def saccades(self):
@@ -194,11 +248,11 @@ class BionicReading:
         self._stopwords = (
             stopwords_set.VERY_LIGHT_STOPWORDS_SET
             if value <= 1 / 4
-            else stopwords_set.LIGHT_STOPWORDS_SET
-            if value <= 1 / 2
-            else stopwords_set.NORMAL_STOPWORDS_SET
-            if value <= 3 / 4
-            else stopwords_set.STRONG_STOPWORDS_SET
+            else (
+                stopwords_set.LIGHT_STOPWORDS_SET
+                if value <= 1 / 2
+                else stopwords_set.NORMAL_STOPWORDS_SET if value <= 3 / 4 else stopwords_set.STRONG_STOPWORDS_SET
+            )
         )
 
     @stopwords.deleter
@@ -323,6 +377,33 @@ class BionicReading:
         """
         del self._highlight_color
 
+    @property
+    def max_memory(self):
+        """
+        It returns the memory budget in bytes of the object.
+        :return: The max_memory is being returned.
+        """
+        return self._max_memory
+
+    @max_memory.setter
+    def max_memory(self, value: Optional[int]):
+        """
+        This function takes in a positive integer (or None for no budget) and sets the memory budget to that value
+
+        :param value: The memory budget in bytes
+        :type value: int (optional)
+        """
+        assert value is None or isinstance(value, int), "please use a max_memory int type"
+        assert value is None or value > 0, "please enter a positive max_memory value"
+        self._max_memory = value
+
+    @max_memory.deleter
+    def max_memory(self):
+        """
+        It deletes the max_memory attribute from the object.
+        """
+        del self._max_memory
+
     def get_rare_words(self, text: str) -> List[str]:
         """
         Takes a string of text, and returns a list of words that appear more than a certain number of times in the text
@@ -333,13 +414,41 @@ class BionicReading:
         """
         vectorizer = CountVectorizer(stop_words=stopwords_set.STRONG_STOPWORDS_SET)
         transformed = vectorizer.fit_transform([text])
-        data = pd.DataFrame(transformed.toarray(), columns=vectorizer.get_feature_names_out()).T
-        data.columns = ["freq"]
-        uncommon_words = data[data["freq"] <= self.rare_words_max_freq].index.tolist()
-        uncommon_words = [word for word in uncommon_words if not string_contains_digit(word)]
+        vocabulary = vectorizer.get_feature_names_out()
+        indices = np.sort(transformed.indices[transformed.data <= self.rare_words_max_freq])
+        uncommon_words = [word for word in vocabulary[indices].tolist() if not string_contains_digit(word)]
 
         return uncommon_words
 
+    def get_rare_words_chunked(self, text: str, chunk_size: int = LOW_MEMORY_CHUNK_SIZE) -> List[str]:
+        """
+        Same as `get_rare_words`, but the text is counted chunk by chunk (cut on whitespaces) in a single counter, so
+        the memory depends on the vocabulary and on the chunk size instead of the size of the text
+
+        :param text: The text to be analyzed
+        :type text: str
+        :param chunk_size: Approximate number of chars counted at once
+        :type chunk_size: int
+        :return: A list of uncommon words
+        """
+        analyzer = CountVectorizer(stop_words=stopwords_set.STRONG_STOPWORDS_SET).build_analyzer()
+        counter: Counter = Counter()
+        start = 0
+        while start < len(text):
+            end = min(start + chunk_size, len(text))
+            if end < len(text):
+                cut = max(text.rfind(" ", start, end), text.rfind("\n", start, end), text.rfind("\t", start, end))
+                end = cut + 1 if cut > start else end
+            counter.update(analyzer(text[start:end]))
+            start = end
+        uncommon_words = [
+            word
+            for word, freq in counter.items()
+            if freq <= self.rare_words_max_freq and not string_contains_digit(word)
+        ]
+
+        return sorted(uncommon_words)
+
     @staticmethod
     def split_text_to_words(text: str) -> List[str]:
         """
@@ -353,6 +462,25 @@ class BionicReading:
 
         return [token for token in tokens if len(token) > 0]
 
+    @staticmethod
+    def iter_text_to_words(text: str) -> Iterator[str]:
+        """
+        It lazily splits a string into words, it yields the same tokens as `split_text_to_words` without holding them all
+        in memory
+
+        :param text: The text to split into words
+        :type text: str
+        :return: An iterator of strings
+        """
+        position = 0
+        for match in re.finditer(SIMPLE_SPLITTER, text):
+            if match.start() > position:
+                yield text[position : match.start()]
+            yield match.group()
+            position = match.end()
+        if position < len(text):
+            yield text[position:]
+
     def opacity_highlight(self, token: str, highlight_format: str = Format.BOLD.value) -> str:
         """
         If the output format is HTML, then return the HTML tag for the given format. Otherwise, return the ANSI escape code
@@ -393,9 +521,13 @@ class BionicReading:
         :return: The first return value is the part of the token that has been read, and the second return value is the
         part of the token that has not been read.
         """
-        if len(token) <= 2:
-            return token[0], token[1:]
-        last_char_index = round(self.fixation * len(token))
+        length = len(token)
+        if self._chars_fixation and length < FIXATION_TABLE_SIZE:
+            last_char_index = self._fixation_table[length]
+        elif self._chars_fixation:
+            last_char_index = round(self._fixation * length)
+        else:
+            last_char_index = fixation_split(token, self._fixation, self._fixation_mode)
 
         return token[:last_char_index], token[last_char_index:]
 
@@ -431,45 +563,123 @@ class BionicReading:
         """
         return self.opacity_highlight(token, self.rare_words_behavior)
 
-    def highlight_tokens(self, tokens: List[str], uncommon_words: List[str]) -> List[str]:
+    def classify_tokens(
+        self, tokens: Iterable[str], uncommon_words: Collection[str], index: int = 0
+    ) -> Generator[Tuple[str, Optional[str], int], None, int]:
         """
-        The function takes a list of tokens and an output format, and returns a list of tokens with the tokens that are
-        highlighted
+        The function takes a list of tokens and yields, for each token, the format it should be highlighted with (None if
+        the token is left as is) and the number of characters of the token concerned by this format
 
-        :param tokens: a list of tokens to highlight
-        :type tokens: List[str]
-        :param uncommon_words: List of all uncommon words
-        :type uncommon_words: List[str]
-        :return: A list of tokens with the tokens that are highlighted.
+        :param tokens: the tokens to classify
+        :type tokens: Iterable[str]
+        :param uncommon_words: Collection of all uncommon words
+        :type uncommon_words: Collection[str]
+        :param index: the number of words already classified, to carry the saccades over consecutive chunks of a text
+        :type index: int
+        :return: An iterator of (token, highlight format, number of characters highlighted), whose return value is the
+        number of words classified.
         """
-        index = 0
-        highlighted_tokens = []
         for token in tokens:
+            highlight_format, length = None, 0
             if token not in self.non_tokens:
                 index += 1
                 if token.isdigit():
                     pass
                 elif token.lower() in uncommon_words:
-                    token = self.rare_words_highlight(token)
+                    highlight_format, length = self.rare_words_behavior, len(token)
                 elif token in self.stopwords and self.stopwords_behavior not in (
                     StopWordsBehavior.HIGHLIGHT.value,
                     StopWordsBehavior.BOLD.value,
                 ):
-                    token = self.stopwords_highlight(token)
+                    if self.stopwords_behavior != StopWordsBehavior.IGNORE.value:
+                        highlight_format, length = self.stopwords_behavior, len(token)
                     index -= 1
                 elif index % self.saccades_highlight() == 0 or index == 1:
-                    (
-                        token_to_highlight,
-                        token_not_to_highlight,
-                    ) = self.fixation_highlight(token)
+                    token_to_highlight, _ = self.fixation_highlight(token)
                     if token in self.stopwords:
-                        token_to_highlight = self.opacity_highlight(token_to_highlight, self.stopwords_behavior)
+                        highlight_format = self.stopwords_behavior
                     else:
-                        token_to_highlight = self.opacity_highlight(token_to_highlight)
-                    token = token_to_highlight + token_not_to_highlight
-            highlighted_tokens.append(token)
+                        highlight_format = Format.BOLD.value
+                    length = len(token_to_highlight)
+            yield token, highlight_format, length
+
+        return index
+
+    def highlight_tokens(self, tokens: List[str], uncommon_words: Collection[str]) -> List[str]:
+        """
+        The function takes a list of tokens and an output format, and returns a list of tokens with the tokens that are
+        highlighted
+
+        :param tokens: a list of tokens to highlight
+        :type tokens: List[str]
+        :param uncommon_words: Collection of all uncommon words
+        :type uncommon_words: Collection[str]
+        :return: A list of tokens with the tokens that are highlighted.
+        """
+        return [
+            self.highlight_token(token, highlight_format, length)
+            for token, highlight_format, length in self.classify_tokens(tokens, uncommon_words)
+        ]
 
-        return highlighted_tokens
+    def highlight_token(self, token: str, highlight_format: Optional[str], length: int) -> str:
+        """
+        It applies to the token the format returned by `classify_tokens`
+
+        :param token: the token to highlight
+        :type token: str
+        :param highlight_format: the format to highlight the token with, None to keep it as is
+        :type highlight_format: str (optional)
+        :param length: the number of characters of the token to highlight
+        :type length: int
+        :return: The highlighted token.
+        """
+        if highlight_format == StopWordsBehavior.REMOVE.value:
+            return self.stopwords_highlight(token)
+        elif highlight_format is not None:
+            return self.opacity_highlight(token[:length], highlight_format) + token[length:]
+
+        return token
+
+    def annotate_tokens(self, tokens: Iterable[str], uncommon_words: Collection[str]) -> List[Span]:
+        """
+        The function takes a list of tokens and returns the list of (start, end, style) annotations to apply on the text
+        made by the concatenation of the tokens, the offsets are python string indices (`spans_to_json` and
+        `spans_to_bytes` convert them to UTF-16 code units)
+
+        :param tokens: the tokens to annotate
+        :type tokens: Iterable[str]
+        :param uncommon_words: Collection of all uncommon words
+        :type uncommon_words: Collection[str]
+        :return: A list of annotations.
+        """
+        return list(self.iter_annotate_tokens(tokens, uncommon_words))
+
+    def iter_annotate_tokens(self, tokens: Iterable[str], uncommon_words: Collection[str]) -> Iterator[Span]:
+        """
+        It lazily yields the annotations returned by `annotate_tokens`
+
+        :param tokens: the tokens to annotate
+        :type tokens: Iterable[str]
+        :param uncommon_words: Collection of all uncommon words
+        :type uncommon_words: Collection[str]
+        :return: An iterator of annotations.
+        """
+        return self.iter_annotate_classified(self.classify_tokens(tokens, uncommon_words))
+
+    @staticmethod
+    def iter_annotate_classified(classified_tokens: Iterable[Tuple[str, Optional[str], int]]) -> Iterator[Span]:
+        """
+        It lazily yields the annotations of the tokens already classified by `classify_tokens`
+
+        :param classified_tokens: the (token, highlight format, number of characters highlighted) of each token
+        :type classified_tokens: Iterable[Tuple[str, Optional[str], int]]
+        :return: An iterator of annotations.
+        """
+        offset = 0
+        for token, highlight_format, length in classified_tokens:
+            if highlight_format is not None and length > 0:
+                yield Span(offset, offset + length, highlight_format)
+            offset += len(token)
 
     @staticmethod
     def tokens_to_text(tokens: List[str]) -> str:
@@ -482,6 +692,18 @@ class BionicReading:
         """
         return "".join(tokens)
 
+    def output_wrapper(self) -> Tuple[str, str]:
+        """
+        If the output format is HTML, then return the HTML tags to put before and after the highlighted text
+        :return: The prefix and the suffix of the output.
+        """
+        if self.output_format == OutputFormat.HTML.value:
+            style = "b {font-weight: %d} " % (self.opacity * 1000)
+            style += "mark {color: %s} " % self.highlight_color
+            return f"<!DOCTYPE html><html><head><style>{style}</style></head><body><p>", "</p></body></html>"
+
+        return "", ""
+
     def to_output_format(self, text: str) -> str:
         """
         If the output format is HTML, then add the HTML tags to the highlighted text
@@ -490,32 +712,300 @@ class BionicReading:
         :type text: str
         :return: The highlighted text.
         """
-        output = text
-        if self.output_format == OutputFormat.HTML.value:
-            style = "b {font-weight: %d} " % (self.opacity * 1000)
-            style += "mark {color: %s} " % self.highlight_color
-            output = f"<!DOCTYPE html><html><head><style>{style}</style></head><body><p>{text}</p></body></html>"
+        prefix, suffix = self.output_wrapper()
 
-        return output
+        return prefix + text + suffix if prefix or suffix else text
 
-    def read_faster(
-        self,
-        text: str,
-    ) -> str:
+    def annotate(self, text: str) -> Tuple[str, List[Span]]:
         """
-        The function takes a string of text, splits it into a list of words, highlights the words, and then returns the
-        highlighted text
+        The function takes a string of text and returns it unchanged along with the list of (start, end, style)
+        annotations, so the client can apply the styles itself
 
         :param text: the text you want to read faster
         :type text: str
-        :return: The highlighted text
+        :return: The original text and its annotations
         """
         tokens = self.split_text_to_words(text)
         uncommon_words = self.get_rare_words(text)
-        highlighted_tokens = self.highlight_tokens(tokens, uncommon_words)
-        highlighted_text = self.tokens_to_text(highlighted_tokens)
 
-        return self.to_output_format(highlighted_text)
+        return text, self.annotate_tokens(tokens, set(uncommon_words))
+
+    def render(self, text: str, uncommon_words: Set[str], profiler: Optional[MemoryProfiler] = None) -> str:
+        """
+        The function takes a string of text and the rare words to use, and returns the text in the output format
+
+        :param text: the text you want to read faster
+        :type text: str
+        :param uncommon_words: Set of all uncommon words
+        :type uncommon_words: Set[str]
+        :param profiler: the profiler measuring the memory of each stage
+        :type profiler: MemoryProfiler (optional)
+        :return: The highlighted text
+        """
+        profiler = profiler if profiler is not None else MemoryProfiler(enabled=False)
+        with profiler.stage("tokenize"):
+            tokens = self.split_text_to_words(text)
+        if self.output_format == OutputFormat.SPANS.value:
+            with profiler.stage("annotate"):
+                return spans_to_json(text, self.annotate_tokens(tokens, uncommon_words))
+        with profiler.stage("highlight"):
+            highlighted_tokens = self.highlight_tokens(tokens, uncommon_words)
+        del tokens
+        with profiler.stage("join"):
+            highlighted_text = self.tokens_to_text(highlighted_tokens)
+        del highlighted_tokens
+        with profiler.stage("wrap"):
+            return self.to_output_format(highlighted_text)
+
+    def render_low_memory(self, text: str, uncommon_words: Set[str], profiler: Optional[MemoryProfiler] = None) -> str:
+        """
+        The function returns the same output as `render`, but the tokens are generated lazily and the highlighted tokens
+        are written one by one in a single buffer, so neither the tokens nor the highlighted tokens are held in memory
+
+        :param text: the text you want to read faster
+        :type text: str
+        :param uncommon_words: Set of all uncommon words
+        :type uncommon_words: Set[str]
+        :param profiler: the profiler measuring the memory of each stage
+        :type profiler: MemoryProfiler (optional)
+        :return: The highlighted text
+        """
+        profiler = profiler if profiler is not None else MemoryProfiler(enabled=False)
+        tokens = self.iter_text_to_words(text)
+        if self.output_format == OutputFormat.SPANS.value:
+            with profiler.stage("annotate"):
+                return spans_to_json(text, self.iter_annotate_tokens(tokens, uncommon_words))
+        with profiler.stage("highlight"):
+            prefix, suffix = self.output_wrapper()
+            buffer = io.StringIO()
+            buffer.write(prefix)
+            for token, highlight_format, length in self.classify_tokens(tokens, uncommon_words):
+                buffer.write(self.highlight_token(token, highlight_format, length))
+            buffer.write(suffix)
+        with profiler.stage("join"):
+            return buffer.getvalue()
+
+    def exceeds_memory(self, text: str) -> bool:
+        """
+        It predicts from the size of the text and the output format whether the default strategy would exceed the memory
+        budget
+
+        :param text: the text you want to read faster
+        :type text: str
+        :return: True if the predicted memory is above max_memory.
+        """
+        return self.max_memory is not None and len(text) * MEMORY_PER_CHAR[self.output_format] > self.max_memory
+
+    def read_faster(self, text: str, profiler: Optional[MemoryProfiler] = None) -> str:
+        """
+        The function takes a string of text, splits it into a list of words, highlights the words, and then returns the
+        highlighted text. If the text is predicted to exceed max_memory, the lower-memory strategy is used
+
+        :param text: the text you want to read faster
+        :type text: str
+        :param profiler: the profiler measuring the peak and retained memory of each stage
+        :type profiler: MemoryProfiler (optional)
+        :return: The highlighted text
+        """
+        profiler = profiler if profiler is not None else MemoryProfiler(enabled=False)
+        with profiler:
+            if self.exceeds_memory(text):
+                with profiler.stage("count"):
+                    uncommon_words = set(self.get_rare_words_chunked(text))
+                return self.render_low_memory(text, uncommon_words, profiler)
+            with profiler.stage("count"):
+                uncommon_words = set(self.get_rare_words(text))
+
+            return self.render(text, uncommon_words, profiler)
+
+    def read_faster_stream(self, chunks: Iterable[str], sketch: Optional[CountMinSketch] = None) -> Iterator[str]:
+        """
+        The function takes an unbounded stream of texts and yields them highlighted one by one. The words frequencies are
+        approximated online by a count-min sketch, so the memory stays constant whatever the length of the stream. As
+        the sketch can only over-estimate, a word flagged as rare is always rare, but some rare words can be missed. The
+        default sketch counts the words over a decaying window of `STREAM_WINDOW_SIZE` words, see
+        `CountMinSketch.from_threshold`, a sketch without decay misses more and more rare words as the stream grows. The
+        chunks can cut words anywhere and the saccades are carried over, so the concatenated output is the highlighted
+        stream (a single html document in html format, json lines in spans format)
+
+        :param chunks: the stream of texts you want to read faster
+        :type chunks: Iterable[str]
+        :param sketch: the sketch holding the words frequencies, defaults to
+            `CountMinSketch.from_threshold(rare_words_max_freq)`
+        :type sketch: CountMinSketch (optional)
+        :return: An iterator of highlighted texts
+        """
+        sketch = sketch if sketch is not None else CountMinSketch.from_threshold(self.rare_words_max_freq)
+        analyzer = CountVectorizer(stop_words=stopwords_set.STRONG_STOPWORDS_SET).build_analyzer()
+        prefix, suffix = self.output_wrapper()
+        if prefix:
+            yield prefix
+        partial_word, index = "", 0
+        for chunk in chunks:
+            text, tokens, partial_word = self.split_chunk(partial_word + chunk)
+            if tokens:
+                words = [word for word in analyzer(text) if not string_contains_digit(word)]
+                classified_tokens, index = self.classify_chunk(tokens, words, sketch, index)
+                yield self.render_classified(text, classified_tokens)
+        if partial_word:
+            words = [word for word in analyzer(partial_word) if not string_contains_digit(word)]
+            classified_tokens, index = self.classify_chunk([partial_word], words, sketch, index)
+            yield self.render_classified(partial_word, classified_tokens)
+        if suffix:
+            yield suffix
+
+    @staticmethod
+    def split_chunk(text: str) -> Tuple[str, List[str], str]:
+        """
+        It splits a chunk of a stream into tokens. The end of the chunk can cut a word, so the trailing partial word is
+        put apart, to be prepended to the next chunk
+
+        :param text: The chunk, prepended by the partial word of the previous chunk
+        :type text: str
+        :return: The chunk without its partial word, its tokens and the partial word.
+        """
+        tokens = BionicReading.split_text_to_words(text)
+        partial_word = tokens.pop() if tokens and not re.fullmatch(SIMPLE_SPLITTER, tokens[-1]) else ""
+
+        return text[: len(text) - len(partial_word)], tokens, partial_word
+
+    def classify_chunk(
+        self, tokens: List[str], words: List[str], sketch: CountMinSketch, index: int = 0
+    ) -> Tuple[List[Tuple[str, Optional[str], int]], int]:
+        """
+        It adds the words of the chunk to the sketch and classifies its tokens, the saccades start from `index`
+
+        :param tokens: The tokens of the chunk
+        :type tokens: List[str]
+        :param words: The words of the chunk, as returned by the CountVectorizer analyzer
+        :type words: List[str]
+        :param sketch: The sketch holding the words frequencies of the stream
+        :type sketch: CountMinSketch
+        :param index: the number of words classified in the previous chunks
+        :type index: int
+        :return: The classified tokens and the number of words classified so far.
+        """
+        uncommon_words = self.get_rare_words_sketch(words, sketch)
+        classifier = self.classify_tokens(tokens, uncommon_words, index)
+        classified_tokens = []
+        while True:
+            try:
+                classified_tokens.append(next(classifier))
+            except StopIteration as stop:
+                return classified_tokens, stop.value
+
+    def render_classified(self, text: str, classified_tokens: List[Tuple[str, Optional[str], int]]) -> str:
+        """
+        It renders the classified tokens of a chunk without the html document around it (see `output_wrapper`), in
+        spans format each chunk is a json line
+
+        :param text: The chunk
+        :type text: str
+        :param classified_tokens: The tokens of the chunk, as returned by `classify_tokens`
+        :type classified_tokens: List[Tuple[str, Optional[str], int]]
+        :return: The highlighted chunk.
+        """
+        if self.output_format == OutputFormat.SPANS.value:
+            return spans_to_json(text, self.iter_annotate_classified(classified_tokens)) + "\n"
+        highlighted_tokens = [self.highlight_token(*classified) for classified in classified_tokens]
+
+        return self.tokens_to_text(highlighted_tokens)
+
+    def get_rare_words_sketch(self, words: List[str], sketch: CountMinSketch) -> Set[str]:
+        """
+        It adds the words of a new chunk to the sketch and returns those whose estimated frequency makes them rare
+
+        :param words: The words of the chunk, as returned by the CountVectorizer analyzer
+        :type words: List[str]
+        :param sketch: The sketch holding the words frequencies of the stream
+        :type sketch: CountMinSketch
+        :return: A set of uncommon words
+        """
+        sketch.decay(len(words))
+        sketch.add(words)
+        unique_words = list(set(words))
+        freq = sketch.estimate(unique_words)
+
+        return {word for word, word_freq in zip(unique_words, freq) if word_freq <= self.rare_words_max_freq}
+
+    def get_rare_words_column(
+        self, texts: List[Optional[str]], rare_words_scope: str = RareWordsScope.ROW.value
+    ) -> List[Set[str]]:
+        """
+        Takes a list of texts and returns for each of them the set of rare words. All the texts are counted in one sparse
+        matrix, the frequencies are either computed per row or over the whole column
+
+        :param texts: The texts to be analyzed, None values are considered as empty texts
+        :type texts: List[Optional[str]]
+        :param rare_words_scope: Compute the words frequencies per row or over the whole column (row, column)
+        :type rare_words_scope: str
+        :return: A list of sets of uncommon words, one per text
+        """
+        possible_values = [scope.value.lower() for scope in RareWordsScope]
+        assert rare_words_scope in possible_values, f"please enter a rare_words_scope within {possible_values}"
+        vectorizer = CountVectorizer(stop_words=stopwords_set.STRONG_STOPWORDS_SET)
+        try:
+            transformed = vectorizer.fit_transform([text or "" for text in texts]).tocsr()
+        except ValueError:  # empty vocabulary
+            return [set() for _ in texts]
+        vocabulary = vectorizer.get_feature_names_out()
+        without_digit = np.array([not string_contains_digit(word) for word in vocabulary], dtype=bool)
+
+        if rare_words_scope == RareWordsScope.COLUMN.value:
+            freq = np.asarray(transformed.sum(axis=0)).ravel()
+            uncommon_words = set(vocabulary[(freq <= self.rare_words_max_freq) & without_digit])
+            return [uncommon_words for _ in texts]
+
+        rare = (transformed.data <= self.rare_words_max_freq) & without_digit[transformed.indices]
+        indptr = transformed.indptr
+        return [
+            set(vocabulary[transformed.indices[start:end][rare[start:end]]])
+            for start, end in zip(indptr[:-1], indptr[1:])
+        ]
+
+    @staticmethod
+    def is_null(value: Any) -> bool:
+        """
+        It returns True if the cell is a missing value (None, NaN, pd.NA, NaT)
+
+        :param value: The cell of the column
+        :type value: Any
+        :return: True or False
+        """
+        return value is None or (not isinstance(value, str) and pd.api.types.is_scalar(value) and bool(pd.isna(value)))
+
+    def read_faster_column(self, column: Any, rare_words_scope: str = RareWordsScope.ROW.value) -> Any:
+        """
+        The function takes a column of texts (pandas Series, pyarrow string array or list) and returns a column of the same
+        type and length with the highlighted texts, null values are kept as null and other non-str values are rejected
+
+        :param column: the texts you want to read faster
+        :type column: pd.Series, pa.Array, pa.ChunkedArray or List[Optional[str]]
+        :param rare_words_scope: Compute the words frequencies per row or over the whole column (row, column)
+        :type rare_words_scope: str
+        :return: The highlighted texts
+        """
+        if pa is not None and isinstance(column, (pa.Array, pa.ChunkedArray)):
+            texts = column.to_pylist()
+        elif isinstance(column, pd.Series):
+            texts = column.tolist()
+        else:
+            texts = list(column)
+        texts = [None if self.is_null(text) else text for text in texts]
+        for text in texts:
+            assert text is None or isinstance(text, str), f"please use a column of str, got {type(text).__name__}"
+        uncommon_words = self.get_rare_words_column(texts, rare_words_scope)
+        outputs = [
+            self.render(text, rare_words) if text is not None else None
+            for text, rare_words in zip(texts, uncommon_words)
+        ]
+
+        if pa is not None and isinstance(column, (pa.Array, pa.ChunkedArray)):
+            return pa.array(outputs, type=pa.string())
+        elif isinstance(column, pd.Series):
+            return pd.Series(outputs, index=column.index, name=column.name, dtype=object)
+
+        return outputs
 
 
 if __name__ == "__main__":
@@ -0,0 +1,157 @@
+import math
+import hashlib
+import numpy as np
+
+from typing import Dict, Iterable, List
+
+from bionic_reading.settings import STREAM_WINDOW_SIZE
+
+
+class CountMinSketch:
+    """Approximate words frequencies in constant memory, estimates are never lower than the true counts."""
+
+    def __init__(self, width: int = 2048, depth: int = 4, decay: float = 1.0):
+        """
+        Inits CountMinSketch
+
+        :param width: Number of counters per row, the larger the smaller is the over-estimation
+        :type width: int
+        :param depth: Number of rows (hash functions), the larger the more likely the estimation is within the bound
+        :type depth: int
+        :param decay: Factor applied to all the counters per word added (see `decay`), 1 keeps all the history, lower
+            values forget the old words (exponentially decaying window of about 1 / (1 - decay) words)
+        :type decay: float
+        """
+        assert isinstance(width, int) and width > 0, "please enter a positive int width"
+        assert isinstance(depth, int) and depth > 0, "please enter a positive int depth"
+        assert 0 < decay <= 1, "please enter a decay value between 0 (excluded) and 1"
+        self.width = width
+        self.depth = depth
+        self.decay_factor = decay
+        self.table = np.zeros((depth, width), dtype=np.float64)
+        self.total = 0.0
+        self._rows = np.arange(depth)[:, None]
+
+    @classmethod
+    def from_error(cls, epsilon: float = 0.001, delta: float = 0.01, decay: float = 1.0) -> "CountMinSketch":
+        """
+        It creates a sketch whose estimates are at most `epsilon * total` above the true count with probability
+        `1 - delta`
+
+        :param epsilon: Over-estimation bound relative to the total number of words added
+        :type epsilon: float
+        :param delta: Probability to exceed the bound
+        :type delta: float
+        :param decay: Factor applied to all the counters per word added
+        :type decay: float
+        :return: A CountMinSketch.
+        """
+        assert 0 < epsilon < 1, "please enter an epsilon value between 0 and 1 (excluded)"
+        assert 0 < delta < 1, "please enter a delta value between 0 and 1 (excluded)"
+        width = int(math.ceil(math.e / epsilon))
+        depth = int(math.ceil(math.log(1 / delta)))
+
+        return cls(width=width, depth=depth, decay=decay)
+
+    @classmethod
+    def from_threshold(
+        cls, threshold: float, window: int = STREAM_WINDOW_SIZE, delta: float = 0.01
+    ) -> "CountMinSketch":
+        """
+        It creates a sketch to decide if words are rare (`count <= threshold`) on an unbounded stream. Without decay the
+        over-estimation grows with the number of words added, and past a few `threshold / epsilon` words no word is rare
+        anymore. The words are counted over a decaying window instead, so the total stays below `window` and the
+        over-estimation below `threshold / 2` with probability `1 - delta`: the words counted at most `threshold / 2`
+        times in the window are flagged, those between `threshold / 2` and `threshold` can be missed
+
+        :param threshold: The max frequency of a rare word
+        :type threshold: float
+        :param window: Number of words after which a word weighs 1/e of its weight
+        :type window: int
+        :param delta: Probability to exceed the bound
+        :type delta: float
+        :return: A CountMinSketch.
+        """
+        assert isinstance(window, int) and window > 1, "please enter an int window greater than 1"
+
+        return cls.from_error(epsilon=max(threshold, 1) / (2 * window), delta=delta, decay=1 - 1 / window)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        It returns the memory used by the counters
+        :return: The number of bytes of the counters table.
+        """
+        return self.table.nbytes
+
+    def _columns(self, words: List[str]) -> np.ndarray:
+        """
+        It hashes the words, the depth hash functions are derived from two 32 bits hashes (h1 + i * h2)
+
+        :param words: The words to hash
+        :type words: List[str]
+        :return: An array of shape (depth, len(words)) with the column of each word for each row.
+        """
+        hashes = np.array(
+            [
+                np.frombuffer(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), dtype=np.uint32)
+                for word in words
+            ],
+            dtype=np.uint64,
+        ).reshape(-1, 2)
+
+        return (hashes[:, 0] + self._rows.astype(np.uint64) * (hashes[:, 1] | 1)) % np.uint64(self.width)
+
+    def update(self, counts: Dict[str, float]):
+        """
+        It adds the words counts to the sketch
+
+        :param counts: The number of occurrences of each word
+        :type counts: Dict[str, float]
+        """
+        if not counts:
+            return
+        words = list(counts)
+        values = np.array([counts[word] for word in words], dtype=np.float64)
+        columns = self._columns(words)
+        np.add.at(self.table, (np.broadcast_to(self._rows, columns.shape), columns), values)
+        self.total += float(values.sum())
+
+    def add(self, words: Iterable[str]):
+        """
+        It adds one occurrence of each word to the sketch
+
+        :param words: The words to add
+        :type words: Iterable[str]
+        """
+        counts: Dict[str, float] = {}
+        for word in words:
+            counts[word] = counts.get(word, 0) + 1
+        self.update(counts)
+
+    def estimate(self, words: List[str]) -> np.ndarray:
+        """
+        It returns the estimated frequency of each word
+
+        :param words: The words to estimate
+        :type words: List[str]
+        :return: An array with the estimated frequency of each word.
+        """
+        if not words:
+            return np.zeros(0, dtype=np.float64)
+        columns = self._columns(words)
+
+        return self.table[np.broadcast_to(self._rows, columns.shape), columns].min(axis=0)
+
+    def decay(self, count: int = 1):
+        """
+        It multiplies all the counters by the decay factor once per word about to be added, so old words weigh less than
+        new ones
+
+        :param count: The number of words about to be added
+        :type count: int
+        """
+        if self.decay_factor < 1 and count > 0:
+            factor = self.decay_factor**count
+            self.table *= factor
+            self.total *= factor
@@ -0,0 +1,298 @@
+import queue
+import time
+import threading
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from sklearn.feature_extraction.text import CountVectorizer
+
+from bionic_reading.data import stopwords_set
+from bionic_reading.settings import PipelineStage
+from bionic_reading.features.bionic_reading import BionicReading
+from bionic_reading.features.frequency_sketch import CountMinSketch
+from bionic_reading.utils.file_utils import string_contains_digit
+
+END_OF_STREAM = object()
+# seconds to wait for each stage to stop, the read stage can stay blocked on the source after a failure
+JOIN_TIMEOUT = 1.0
+
+
+@dataclass
+class StageMetrics:
+    items: int = 0
+    busy_seconds: float = 0.0
+    wait_input_seconds: float = 0.0
+    wait_output_seconds: float = 0.0
+    max_queue_depth: int = 0
+    total_queue_depth: int = 0
+
+    @property
+    def mean_queue_depth(self) -> float:
+        """
+        It returns the mean depth of the input queue of the stage, sampled each time an item is taken
+        :return: The mean queue depth.
+        """
+        return self.total_queue_depth / self.items if self.items else 0.0
+
+    def sample(self, depth: int):
+        """
+        It records the depth of the input queue of the stage
+
+        :param depth: The number of items waiting in the queue
+        :type depth: int
+        """
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        self.total_queue_depth += depth
+
+
+class BionicReadingPipeline:
+    """Run read_faster over a stream of chunks as overlapping stages (read, tokenize, classify, render, write)."""
+
+    def __init__(self, bionic_reading: BionicReading, queue_size: int = 8, sketch: Optional[CountMinSketch] = None):
+        """
+        Inits BionicReadingPipeline
+
+        :param bionic_reading: The config used to highlight the chunks
+        :type bionic_reading: BionicReading
+        :param queue_size: Max number of chunks waiting between two stages, a full queue blocks the stage before it
+        :type queue_size: int
+        :param sketch: the sketch holding the words frequencies, shared by all the runs of the pipeline, defaults to a
+            new `CountMinSketch.from_threshold(rare_words_max_freq)` at each run
+        :type sketch: CountMinSketch (optional)
+        """
+        assert isinstance(queue_size, int) and queue_size > 0, "please enter a positive int queue_size"
+        self.bionic_reading = bionic_reading
+        self.queue_size = queue_size
+        self._shared_sketch = sketch
+        self.sketch = (
+            sketch if sketch is not None else CountMinSketch.from_threshold(bionic_reading.rare_words_max_freq)
+        )
+        self.analyzer = CountVectorizer(stop_words=stopwords_set.STRONG_STOPWORDS_SET).build_analyzer()
+        self.metrics: Dict[str, StageMetrics] = {}
+        self._stop = threading.Event()
+        self._errors: List[BaseException] = []
+        self._carry = ""
+        self._index = 0
+
+    def tokenize(self, chunk: str) -> Any:
+        """
+        It splits the chunk into tokens and into the words counted for the rare words. The chunks of the source can cut
+        a word, so the trailing partial word is carried over to the next chunk
+
+        :param chunk: The chunk of text
+        :type chunk: str
+        :return: The chunk cut on its last separator, its tokens and its words, None if the chunk has no separator.
+        """
+        text, tokens, self._carry = self.bionic_reading.split_chunk(self._carry + chunk)
+        if not tokens:
+            return None
+        words = [word for word in self.analyzer(text) if not string_contains_digit(word)]
+
+        return text, tokens, words
+
+    def flush_tokenize(self) -> Any:
+        """
+        It tokenizes the word carried over at the end of the stream
+        :return: The last word, its tokens and its words, None if nothing was carried over.
+        """
+        text, self._carry = self._carry, ""
+        if not text:
+            return None
+        words = [word for word in self.analyzer(text) if not string_contains_digit(word)]
+
+        return text, [text], words
+
+    def classify(self, item: Any) -> Any:
+        """
+        It updates the words frequencies and classifies the tokens of the chunk, the saccades are carried over from the
+        previous chunk
+
+        :param item: The chunk, its tokens and its words
+        :return: The chunk and its classified tokens.
+        """
+        chunk, tokens, words = item
+        classified_tokens, self._index = self.bionic_reading.classify_chunk(tokens, words, self.sketch, self._index)
+
+        return chunk, classified_tokens
+
+    def render(self, item: Any) -> str:
+        """
+        It turns the classified tokens of the chunk into the output format, without the html document around it (written
+        once by `run`). In spans format, each chunk is a json line
+
+        :param item: The chunk and its classified tokens
+        :return: The highlighted chunk.
+        """
+        return self.bionic_reading.render_classified(*item)
+
+    def _put(self, output_queue: queue.Queue, item: Any, metrics: StageMetrics) -> bool:
+        """
+        It waits until there is room in the queue (backpressure) or until the pipeline is stopped
+
+        :return: False if the pipeline has been stopped.
+        """
+        started = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                output_queue.put(item, timeout=0.1)
+                metrics.wait_output_seconds += time.perf_counter() - started
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def _get(self, input_queue: queue.Queue, metrics: StageMetrics) -> Any:
+        """
+        It waits for the next item of the queue, or returns END_OF_STREAM if the pipeline is stopped
+        """
+        started = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                item = input_queue.get(timeout=0.1)
+                metrics.wait_input_seconds += time.perf_counter() - started
+                if item is not END_OF_STREAM:
+                    metrics.sample(input_queue.qsize() + 1)
+                return item
+            except queue.Empty:
+                continue
+
+        return END_OF_STREAM
+
+    def _read(self, chunks: Iterable[str], output_queue: queue.Queue, metrics: StageMetrics):
+        """
+        It pulls the chunks from the source, the time spent waiting for the source is counted as busy time
+        """
+        try:
+            iterator = iter(chunks)
+            while not self._stop.is_set():
+                started = time.perf_counter()
+                chunk = next(iterator, END_OF_STREAM)
+                metrics.busy_seconds += time.perf_counter() - started
+                if chunk is END_OF_STREAM or not self._put(output_queue, chunk, metrics):
+                    break
+                metrics.items += 1
+        except BaseException as error:
+            self._fail(error)
+        finally:
+            self._put(output_queue, END_OF_STREAM, metrics)
+
+    def _work(
+        self,
+        function: Callable,
+        input_queue: queue.Queue,
+        output_queue: queue.Queue,
+        metrics: StageMetrics,
+        flush: Optional[Callable] = None,
+    ):
+        """
+        It applies the function of the stage to each item of its input queue, None results are not passed on. At the
+        end of the stream, the result of `flush` is passed on
+        """
+        try:
+            while True:
+                item = self._get(input_queue, metrics)
+                if item is END_OF_STREAM:
+                    if flush is not None and not self._stop.is_set():
+                        result = flush()
+                        if result is not None:
+                            self._put(output_queue, result, metrics)
+                    break
+                started = time.perf_counter()
+                result = function(item)
+                metrics.busy_seconds += time.perf_counter() - started
+                metrics.items += 1
+                if result is not None and not self._put(output_queue, result, metrics):
+                    break
+        except BaseException as error:
+            self._fail(error)
+        finally:
+            self._put(output_queue, END_OF_STREAM, metrics)
+
+    def _fail(self, error: BaseException):
+        """
+        It records the error and stops all the stages
+        """
+        self._errors.append(error)
+        self._stop.set()
+
+    def run(self, chunks: Iterable[str], write: Callable[[str], Any]) -> Dict[str, StageMetrics]:
+        """
+        It highlights the chunks in order and passes them to `write`. Every stage runs in its own thread (the write
+        stage runs in the calling thread), so reading from slow I/O overlaps with the processing of previous chunks. The
+        chunks are re-cut on the separators and the saccades are carried over, so the output doesn't depend on how the
+        source is chunked, except for the rare words whose frequencies are estimated on the words read so far (by this
+        run, unless a sketch was given to the pipeline). If a
+        stage fails, the error is raised without waiting for the source, the read stage may stay blocked on it
+
+        :param chunks: the stream of texts you want to read faster
+        :type chunks: Iterable[str]
+        :param write: the function called with each highlighted chunk
+        :type write: Callable[[str], Any]
+        :return: The metrics of each stage, the stage with the highest busy time is the bottleneck, the stages before it
+        have their output queue full.
+        """
+        self._stop.clear()
+        self._errors = []
+        self.metrics = {stage.value: StageMetrics() for stage in PipelineStage}
+        self._carry, self._index = "", 0
+        if self._shared_sketch is None:
+            self.sketch = CountMinSketch.from_threshold(self.bionic_reading.rare_words_max_freq)
+        queues: List[queue.Queue] = [queue.Queue(maxsize=self.queue_size) for _ in range(len(PipelineStage) - 1)]
+        functions = [self.tokenize, self.classify, self.render]
+        flushes = [self.flush_tokenize, None, None]
+        threads = [
+            threading.Thread(
+                target=self._read, args=(chunks, queues[0], self.metrics[PipelineStage.READ.value]), daemon=True
+            )
+        ]
+        for index, (function, flush, stage) in enumerate(zip(functions, flushes, list(PipelineStage)[1:-1])):
+            threads.append(
+                threading.Thread(
+                    target=self._work,
+                    args=(function, queues[index], queues[index + 1], self.metrics[stage.value], flush),
+                    daemon=True,
+                )
+            )
+        for thread in threads:
+            thread.start()
+
+        metrics = self.metrics[PipelineStage.WRITE.value]
+        prefix, suffix = self.bionic_reading.output_wrapper()
+        try:
+            if prefix:
+                write(prefix)
+            while True:
+                item = self._get(queues[-1], metrics)
+                if item is END_OF_STREAM:
+                    break
+                started = time.perf_counter()
+                write(item)
+                metrics.busy_seconds += time.perf_counter() - started
+                metrics.items += 1
+            if suffix and not self._errors:
+                write(suffix)
+        except BaseException as error:
+            self._fail(error)
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join(timeout=JOIN_TIMEOUT)
+        if self._errors:
+            raise self._errors[0]
+
+        return self.metrics
+
+    def report(self) -> str:
+        """
+        It formats the metrics of the last run as a table, one line per stage
+        :return: The report.
+        """
+        lines = [f"{'stage':<10}{'items':>8}{'busy (s)':>10}{'wait in (s)':>13}{'wait out (s)':>14}{'mean depth':>12}"]
+        lines += [
+            f"{stage:<10}{metrics.items:>8}{metrics.busy_seconds:>10.3f}{metrics.wait_input_seconds:>13.3f}"
+            f"{metrics.wait_output_seconds:>14.3f}{metrics.mean_queue_depth:>12.2f}"
+            for stage, metrics in self.metrics.items()
+        ]
+
+        return "\n".join(lines)
@@ -0,0 +1,380 @@
+import os
+import json
+import time
+import random
+import argparse
+import threading
+import subprocess
+import numpy as np
+import http.client
+import urllib.error
+import urllib.request
+
+from datetime import datetime, timezone
+from importlib import metadata
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from bionic_reading.features.bionic_reading import BionicReading
+from bionic_reading.settings import LoadTestMode
+
+SAMPLE_TEXT = (
+    "Recurrent models typically factor computation along the symbol positions of the input and output sequences. "
+    "Aligning the positions to steps in computation time, they generate a sequence of hidden states, as a function of "
+    "the previous hidden state and the input for position t. This inherently sequential nature precludes "
+    "parallelization within training examples, which becomes critical at longer sequence lengths.\n"
+)
+DEFAULT_SCENARIOS: List[Dict[str, Any]] = [
+    {"name": "short", "weight": 0.6, "size": 500, "params": {"output_format": "html"}},
+    {"name": "medium", "weight": 0.3, "size": 5_000, "params": {"output_format": "python", "rare_words_max_freq": 2}},
+    {"name": "long", "weight": 0.1, "size": 50_000, "params": {"output_format": "spans", "max_memory": 1_000_000}},
+]
+
+
+def get_version() -> str:
+    """
+    It returns the version of the code under test: `git describe` of the checkout if available, else the version of the
+    installed package
+    :return: The version.
+    """
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=5,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        pass
+    try:
+        return metadata.version("bionic-reading")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+class RequestResult(NamedTuple):
+    scenario: str
+    latency: float
+    ok: bool
+
+
+class BionicReadingHandler(BaseHTTPRequestHandler):
+    """Answer `POST /read_faster` with a json body {"text": str, "params": dict} by the highlighted text."""
+
+    def do_POST(self):
+        if self.path != "/read_faster":
+            self.send_error(404)
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            output = BionicReading(**body.get("params", {})).read_faster(text=body["text"])
+        except (AssertionError, KeyError, TypeError, ValueError) as error:
+            self.send_error(400, str(error))
+            return
+        except Exception as error:
+            self.send_error(500, str(error))
+            return
+        data = output.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class BionicReadingServer:
+    """Local in-process http server around `BionicReading.read_faster`, standing in for the production service."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Inits BionicReadingServer
+
+        :param host: The host to bind
+        :type host: str
+        :param port: The port to bind, 0 picks a free port
+        :type port: int
+        """
+        self.httpd = ThreadingHTTPServer((host, port), BionicReadingHandler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """
+        It returns the url of the read_faster endpoint
+        :return: The url.
+        """
+        host, port = self.httpd.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode("utf-8")
+        return f"http://{host}:{port}/read_faster"
+
+    def __enter__(self) -> "BionicReadingServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+class LoadTest:
+    """Replay a weighted mix of documents and settings against the server and measure the latency."""
+
+    def __init__(
+        self,
+        url: str,
+        scenarios: Optional[List[Dict[str, Any]]] = None,
+        mode: str = LoadTestMode.OPEN.value,
+        rate: float = 20.0,
+        concurrency: int = 8,
+        duration: float = 10.0,
+        timeout: float = 30.0,
+        seed: int = 0,
+    ):
+        """
+        Inits LoadTest
+
+        :param url: The url of the read_faster endpoint
+        :type url: str
+        :param scenarios: The mix of requests, each one has a name, a weight, a document size (chars) and the params of
+            BionicReading, defaults to DEFAULT_SCENARIOS
+        :type scenarios: List[Dict[str, Any]] (optional)
+        :param mode: open: requests are sent at the target rate whatever the latency (Poisson arrivals), closed: each
+            of the `concurrency` clients sends its next request when the previous one is answered (open, closed)
+        :type mode: str
+        :param rate: Target requests per second (open mode)
+        :type rate: float
+        :param concurrency: Number of clients (closed mode) or max number of requests in flight (open mode)
+        :type concurrency: int
+        :param duration: Duration of the test in seconds
+        :type duration: float
+        :param timeout: Timeout of each request in seconds
+        :type timeout: float
+        :param seed: Seed of the scenarios and arrivals draws
+        :type seed: int
+        """
+        possible_values = [load_test_mode.value.lower() for load_test_mode in LoadTestMode]
+        assert mode in possible_values, f"please enter a mode within {possible_values}"
+        assert rate > 0, "please enter a positive rate"
+        assert isinstance(concurrency, int) and concurrency > 0, "please enter a positive int concurrency"
+        self.url = url
+        self.scenarios = scenarios if scenarios is not None else DEFAULT_SCENARIOS
+        self.mode = mode
+        self.rate = rate
+        self.concurrency = concurrency
+        self.duration = duration
+        self.timeout = timeout
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.payloads = {
+            scenario["name"]: json.dumps(
+                {"text": self.make_document(int(scenario["size"])), "params": scenario.get("params", {})}
+            ).encode("utf-8")
+            for scenario in self.scenarios
+        }
+
+    @staticmethod
+    def make_document(size: int) -> str:
+        """
+        It builds a document of `size` chars by repeating a sample text
+
+        :param size: The number of chars
+        :type size: int
+        :return: The document.
+        """
+        return (SAMPLE_TEXT * (size // len(SAMPLE_TEXT) + 1))[:size]
+
+    def pick_scenario(self) -> str:
+        """
+        It draws a scenario according to the weights
+        :return: The name of the scenario.
+        """
+        with self._lock:
+            scenario = self.random.choices(self.scenarios, weights=[float(s.get("weight", 1)) for s in self.scenarios])[
+                0
+            ]
+
+        return scenario["name"]
+
+    def send(self, scenario: str, scheduled: Optional[float] = None) -> RequestResult:
+        """
+        It sends one request. The latency is measured from the scheduled time if given, so the time spent waiting for
+        a free client counts in the latency (no coordinated omission in open mode). Connection errors, timeouts and
+        malformed or truncated responses count as errors
+
+        :param scenario: The name of the scenario
+        :type scenario: str
+        :param scheduled: The time at which the request should have been sent (time.perf_counter)
+        :type scheduled: float (optional)
+        :return: The result of the request.
+        """
+        started = scheduled if scheduled is not None else time.perf_counter()
+        request = urllib.request.Request(
+            self.url, data=self.payloads[scenario], headers={"Content-Type": "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+                ok = response.status == 200
+        except (urllib.error.URLError, http.client.HTTPException, OSError):
+            ok = False
+
+        return RequestResult(scenario, time.perf_counter() - started, ok)
+
+    def run_open(self) -> List[RequestResult]:
+        """
+        It sends the requests at the target rate with exponential inter-arrival times
+        :return: The results of all the requests.
+        """
+        futures = []
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            start = time.perf_counter()
+            scheduled = start
+            while scheduled - start < self.duration:
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                futures.append(executor.submit(self.send, self.pick_scenario(), scheduled))
+                scheduled += self.random.expovariate(self.rate)
+
+        return [future.result() for future in futures]
+
+    def run_closed(self) -> List[RequestResult]:
+        """
+        It runs `concurrency` clients sending their requests one after the other
+        :return: The results of all the requests.
+        """
+        deadline = time.perf_counter() + self.duration
+
+        def client() -> List[RequestResult]:
+            results = []
+            while time.perf_counter() < deadline:
+                results.append(self.send(self.pick_scenario()))
+            return results
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(client) for _ in range(self.concurrency)]
+
+        return [result for future in futures for result in future.result()]
+
+    @staticmethod
+    def summarize(results: List[RequestResult], elapsed: float) -> Dict[str, Any]:
+        """
+        It computes the latency percentiles (ms), the throughput and the error rate of the results
+
+        :param results: The results of the requests
+        :type results: List[RequestResult]
+        :param elapsed: The duration of the test in seconds
+        :type elapsed: float
+        :return: A dictionary of metrics.
+        """
+        latencies = np.array([result.latency for result in results if result.ok]) * 1000
+        errors = sum(not result.ok for result in results)
+        summary: Dict[str, Any] = {
+            "requests": len(results),
+            "errors": errors,
+            "error_rate": errors / len(results) if results else 0.0,
+            "throughput": (len(results) - errors) / elapsed if elapsed > 0 else 0.0,
+        }
+        if len(latencies):
+            summary["latency_ms"] = {
+                "mean": float(latencies.mean()),
+                "p50": float(np.percentile(latencies, 50)),
+                "p90": float(np.percentile(latencies, 90)),
+                "p99": float(np.percentile(latencies, 99)),
+                "max": float(latencies.max()),
+            }
+
+        return summary
+
+    def run(self) -> Dict[str, Any]:
+        """
+        It runs the load test and returns the overall and per scenario metrics, with the version of the code and the
+        start time (UTC) so the results of different runs can be compared
+        :return: A json serializable dictionary.
+        """
+        timestamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        start = time.perf_counter()
+        results = self.run_open() if self.mode == LoadTestMode.OPEN.value else self.run_closed()
+        elapsed = time.perf_counter() - start
+        report = {
+            "version": get_version(),
+            "timestamp": timestamp,
+            "mode": self.mode,
+            "rate": self.rate if self.mode == LoadTestMode.OPEN.value else None,
+            "concurrency": self.concurrency,
+            "duration": elapsed,
+            "scenarios": self.scenarios,
+            **self.summarize(results, elapsed),
+        }
+        report["per_scenario"] = {
+            scenario["name"]: self.summarize([r for r in results if r.scenario == scenario["name"]], elapsed)
+            for scenario in self.scenarios
+        }
+
+        return report
+
+
+def main(args: Optional[List[str]] = None):
+    """
+    It starts a local server (unless --url is given), runs the load test and saves the results as json
+    """
+    parser = argparse.ArgumentParser(description="Load test the read_faster rendering path")
+    parser.add_argument("--url", default=None, help="endpoint to test, defaults to a local in-process server")
+    parser.add_argument(
+        "--mode", default=LoadTestMode.OPEN.value, choices=[load_test_mode.value for load_test_mode in LoadTestMode]
+    )
+    parser.add_argument("--rate", type=float, default=20.0, help="requests per second (open mode)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--timeout", type=float, default=30.0, help="timeout of each request in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the scenarios and arrivals draws")
+    parser.add_argument("--scenarios", default=None, help="json file with the mix of requests")
+    parser.add_argument("--output", default="load_test.json", help="json file where the results are saved")
+    options = parser.parse_args(args)
+
+    scenarios = None
+    if options.scenarios is not None:
+        with open(options.scenarios, "r") as file:
+            scenarios = json.load(file)
+
+    def run_load_test(url: str) -> Dict[str, Any]:
+        return LoadTest(
+            url,
+            scenarios=scenarios,
+            mode=options.mode,
+            rate=options.rate,
+            concurrency=options.concurrency,
+            duration=options.duration,
+            timeout=options.timeout,
+            seed=options.seed,
+        ).run()
+
+    if options.url is None:
+        with BionicReadingServer() as server:
+            report = run_load_test(server.url)
+    else:
+        report = run_load_test(options.url)
+
+    with open(options.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(
+        json.dumps(
+            {key: report[key] for key in ("requests", "error_rate", "throughput", "latency_ms") if key in report}
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,21 @@ from enum import Enum
 
 
 SIMPLE_SPLITTER = "([\t\] \n-.!?;:(){}'/[])"
+# number of chars counted at once when the memory budget is exceeded
+LOW_MEMORY_CHUNK_SIZE = 1 << 16
+# fixation lengths are precomputed for the words shorter than this size
+FIXATION_TABLE_SIZE = 64
+# number of words whose graphemes/syllables split is memoized
+FIXATION_CACHE_SIZE = 8192
+# number of words after which a word counted by the stream sketch weighs 1/e of its weight
+STREAM_WINDOW_SIZE = 20_000
 
 
 class OutputFormat(Enum):
     PYTHON = "python"
     TEXT = "text"
     HTML = "html"
+    SPANS = "spans"
 
 
 class StopWordsBehavior(Enum):
@@ -25,6 +34,30 @@ class RareBehavior(Enum):
     BOLD = "bold"
 
 
+class RareWordsScope(Enum):
+    ROW = "row"
+    COLUMN = "column"
+
+
+class FixationMode(Enum):
+    CHARS = "chars"
+    GRAPHEMES = "graphemes"
+    SYLLABLES = "syllables"
+
+
+class PipelineStage(Enum):
+    READ = "read"
+    TOKENIZE = "tokenize"
+    CLASSIFY = "classify"
+    RENDER = "render"
+    WRITE = "write"
+
+
+class LoadTestMode(Enum):
+    OPEN = "open"
+    CLOSED = "closed"
+
+
 class Format(Enum):
     STRIKETHROUGH = "strikethrough"
     HIGHLIGHT = "highlight"
@@ -38,6 +71,24 @@ class Colors(Enum):
     BLUE = "blue"
 
 
+# approximate peak memory (bytes) used by `read_faster` per char of input text, for each output format
+MEMORY_PER_CHAR = {
+    OutputFormat.PYTHON.value: 32,
+    OutputFormat.TEXT.value: 32,
+    OutputFormat.HTML.value: 30,
+    OutputFormat.SPANS.value: 60,
+}
+
+# SPANS STYLE CODES (index is the code used in the json/binary annotations)
+SPAN_STYLES = [
+    Format.BOLD.value,
+    Format.HIGHLIGHT.value,
+    Format.UNDERLINE.value,
+    Format.STRIKETHROUGH.value,
+    StopWordsBehavior.REMOVE.value,
+]
+
+
 # ROOT PATH
 PROJECT_PATH = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(PROJECT_PATH)
@@ -35,3 +35,17 @@ class TestBionicReading(unittest.TestCase):
             BionicReading(fixation=0.6, saccades=0.75, opacity=0.7, output_format="html").read_faster(text=text)
             == expected_output
         )
+
+    def test_spans_match_html(self):
+        text = "We are happy if as many people as possible can use the advantage of Bionic Reading."
+        tags = {"bold": "b", "highlight": "mark", "underline": "u", "strikethrough": "s"}
+        bionic_reading = BionicReading(fixation=0.6, saccades=0.75, opacity=0.7, output_format="spans")
+        original_text, spans = bionic_reading.annotate(text)
+        rendered, offset = "", 0
+        for start, end, style in spans:
+            rendered += text[offset:start] + f"<{tags[style]}>{text[start:end]}</{tags[style]}>"
+            offset = end
+        rendered += text[offset:]
+        bionic_reading.output_format = "html"
+        self.assertEqual(original_text, text)
+        self.assertIn(f"<p>{rendered}</p>", bionic_reading.read_faster(text=text))
@@ -0,0 +1,47 @@
+import unittest
+
+import pandas as pd
+import pyarrow as pa
+
+from bionic_reading.features.bionic_reading import BionicReading
+
+
+class TestBionicReadingColumn(unittest.TestCase):
+    texts = [
+        "We are happy if as many people as possible can use the advantage of Bionic Reading.",
+        None,
+        "Reading reading reading is good, people like reading.",
+        "",
+    ]
+
+    def test_series_matches_read_faster(self):
+        bionic_reading = BionicReading(output_format="python", rare_words_max_freq=1)
+        column = pd.Series(self.texts, index=[10, 11, 12, 13], name="text")
+        output = bionic_reading.read_faster_column(column)
+        self.assertEqual(list(output.index), [10, 11, 12, 13])
+        self.assertEqual(output.name, "text")
+        self.assertIsNone(output[11])
+        for index in (10, 12):
+            self.assertEqual(output[index], bionic_reading.read_faster(text=column[index]))
+
+    def test_arrow(self):
+        bionic_reading = BionicReading(output_format="html")
+        output = bionic_reading.read_faster_column(pa.chunked_array([self.texts[:2], self.texts[2:]]))
+        self.assertEqual(len(output), len(self.texts))
+        self.assertEqual(output[0].as_py(), bionic_reading.read_faster(text=self.texts[0]))
+        self.assertFalse(output[1].is_valid)
+
+    def test_column_scope(self):
+        bionic_reading = BionicReading(rare_words_max_freq=1)
+        row_words = bionic_reading.get_rare_words_column(self.texts, rare_words_scope="row")
+        column_words = bionic_reading.get_rare_words_column(self.texts, rare_words_scope="column")
+        self.assertIn("people", row_words[0])
+        self.assertNotIn("people", column_words[0])
+        self.assertEqual(row_words[1], set())
+
+    def test_non_str_values(self):
+        bionic_reading = BionicReading()
+        output = bionic_reading.read_faster_column(pd.Series(["Bionic Reading", float("nan"), pd.NA]))
+        self.assertEqual(output.isna().tolist(), [False, True, True])
+        with self.assertRaises(AssertionError):
+            bionic_reading.read_faster_column(pd.Series(["Bionic Reading", 3]))
@@ -0,0 +1,33 @@
+import unittest
+
+from bionic_reading.features.bionic_reading import BionicReading
+from bionic_reading.utils.fixation_utils import fixation_split, grapheme_boundaries, syllable_boundaries
+
+
+class TestFixationUtils(unittest.TestCase):
+    def test_grapheme_boundaries(self):
+        self.assertEqual(grapheme_boundaries("cafe\u0301"), [1, 2, 3, 5])
+        self.assertEqual(grapheme_boundaries("\U0001f44d\U0001f3fd\U0001f468\u200d\U0001f469\u200d\U0001f467"), [2, 7])
+        self.assertEqual(grapheme_boundaries("\U0001f1eb\U0001f1f7\U0001f1e9\U0001f1ea"), [2, 4])
+
+    def test_syllable_boundaries(self):
+        self.assertEqual(syllable_boundaries("happy"), [3, 5])
+        self.assertEqual(syllable_boundaries("reading"), [3, 7])
+        self.assertEqual(syllable_boundaries("the"), [3])
+
+    def test_fixation_split(self):
+        self.assertEqual(fixation_split("cafe\u0301s", 0.7, "graphemes"), 5)
+        self.assertEqual(fixation_split("possible", 0.6, "syllables"), 6)
+        self.assertEqual(fixation_split("\U0001f44d\U0001f3fd", 0.6, "graphemes"), 2)
+
+    def test_fixation_table(self):
+        bionic_reading = BionicReading(fixation=0.6)
+        for token in ("a", "we", "are", "possible", "x" * 200):
+            expected = 1 if len(token) <= 2 else round(0.6 * len(token))
+            self.assertEqual(bionic_reading.fixation_highlight(token), (token[:expected], token[expected:]))
+
+    def test_fixation_mode_setter(self):
+        bionic_reading = BionicReading(fixation=0.7)
+        self.assertEqual(bionic_reading.fixation_highlight("cafe\u0301s")[0], "cafe")
+        bionic_reading.fixation_mode = "graphemes"
+        self.assertEqual(bionic_reading.fixation_highlight("cafe\u0301s")[0], "cafe\u0301")
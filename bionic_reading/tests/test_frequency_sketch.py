@@ -0,0 +1,92 @@
+import unittest
+from typing import Dict, List, Tuple
+from collections import Counter
+
+import numpy as np
+
+from bionic_reading.features.bionic_reading import BionicReading
+from bionic_reading.features.frequency_sketch import CountMinSketch
+from bionic_reading.features.pipeline import BionicReadingPipeline
+
+
+class TestCountMinSketch(unittest.TestCase):
+    def test_accuracy_against_exact_counts(self):
+        epsilon, delta = 0.005, 0.01
+        rng = np.random.default_rng(0)
+        words = [f"word{index}" for index in rng.zipf(1.3, size=50_000) if index < 100_000]
+        sketch = CountMinSketch.from_error(epsilon=epsilon, delta=delta)
+        for start in range(0, len(words), 1000):
+            sketch.add(words[start : start + 1000])
+
+        exact = Counter(words)
+        vocabulary = list(exact)
+        estimates = sketch.estimate(vocabulary)
+        errors = estimates - np.array([exact[word] for word in vocabulary])
+        self.assertEqual(sketch.total, len(words))
+        self.assertTrue((errors >= 0).all())
+        self.assertGreaterEqual((errors <= epsilon * len(words)).mean(), 1 - delta)
+
+    @staticmethod
+    def rare_words_recall(sketch: CountMinSketch, words: List[str], threshold: int) -> Tuple[float, float]:
+        bionic_reading = BionicReading(rare_words_max_freq=threshold)
+        exact: Dict[str, float] = {}
+        scale = 1.0
+        true_positives = false_negatives = false_positives = 0
+        for start in range(0, len(words), 1000):
+            chunk = words[start : start + 1000]
+            # exact counts with the same decaying window, stored relatively to `scale` to decay them lazily
+            scale /= sketch.decay_factor ** len(chunk)
+            for word in chunk:
+                exact[word] = exact.get(word, 0.0) + scale
+            flagged = bionic_reading.get_rare_words_sketch(chunk, sketch)
+            for word in set(chunk):
+                rare = exact[word] / scale <= threshold
+                true_positives += rare and word in flagged
+                false_negatives += rare and word not in flagged
+                false_positives += not rare and word in flagged
+
+        return true_positives / (true_positives + false_positives), true_positives / (true_positives + false_negatives)
+
+    def test_rare_words_over_a_long_stream(self):
+        rng = np.random.default_rng(0)
+        words = [f"word{index}" for index in rng.zipf(1.2, size=200_000)]
+        precision, recall = self.rare_words_recall(CountMinSketch.from_threshold(5), words, threshold=5)
+        self.assertEqual(precision, 1.0)
+        self.assertGreaterEqual(recall, 0.99)
+        _, recall = self.rare_words_recall(CountMinSketch.from_error(), words, threshold=5)
+        self.assertLess(recall, 0.9)
+
+    def test_decay(self):
+        sketch = CountMinSketch(width=64, depth=2, decay=0.5)
+        sketch.add(["old"] * 8)
+        sketch.decay()
+        sketch.add(["new"] * 8)
+        self.assertEqual(list(sketch.estimate(["old", "new"])), [4, 8])
+
+    def test_stream_matches_read_faster(self):
+        text = "We are happy if as many people as possible can use the advantage of Bionic Reading. Happy reading!"
+        bionic_reading = BionicReading(output_format="python", rare_words_max_freq=1)
+        stream = bionic_reading.read_faster_stream([text], sketch=CountMinSketch(width=2**16, depth=4))
+        self.assertEqual(list(stream), [bionic_reading.read_faster(text=text)])
+
+    def test_stream_word_cut_between_chunks(self):
+        text = "We are happy if as many people as possible can use the advantage of Bionic Reading. Happy reading!"
+        chunks = [
+            "We are happy if as ma",
+            "ny people as possible can use the advan",
+            "tage of Bionic Reading. Happy rea",
+            "ding!",
+        ]
+        for output_format in ("html", "python"):
+            bionic_reading = BionicReading(output_format=output_format, rare_words_max_freq=0)
+            output = list(bionic_reading.read_faster_stream(chunks, sketch=CountMinSketch(width=2**16, depth=4)))
+            self.assertEqual("".join(output), bionic_reading.read_faster(text=text))
+            self.assertEqual("".join(output).count("<!DOCTYPE html>"), output_format == "html")
+
+    def test_stream_matches_pipeline(self):
+        chunks = ["We are happy if as many people as possible can use the advan", "tage of Bionic Reading. "] * 20
+        for output_format in ("html", "python", "spans"):
+            bionic_reading = BionicReading(output_format=output_format, rare_words_max_freq=3)
+            output: List[str] = []
+            BionicReadingPipeline(bionic_reading, sketch=CountMinSketch(1024, 4)).run(chunks, output.append)
+            self.assertEqual(list(bionic_reading.read_faster_stream(chunks, sketch=CountMinSketch(1024, 4))), output)
@@ -0,0 +1,57 @@
+import json
+import os
+import tempfile
+import unittest
+
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler
+
+from bionic_reading.server.load_test import BionicReadingServer, LoadTest, main
+
+
+class TruncatingHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Length", "1000")
+        self.end_headers()
+        self.wfile.write(b"truncated")
+        self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+class TestLoadTest(unittest.TestCase):
+    scenarios = [
+        {"name": "short", "weight": 1, "size": 200, "params": {"output_format": "html"}},
+        {"name": "invalid", "weight": 1, "size": 200, "params": {"output_format": "pdf"}},
+    ]
+
+    def test_open_and_closed(self):
+        with BionicReadingServer() as server:
+            for mode in ("open", "closed"):
+                report = LoadTest(server.url, self.scenarios, mode=mode, rate=50, concurrency=2, duration=0.5).run()
+                self.assertGreater(report["requests"], 0)
+                self.assertEqual(report["per_scenario"]["short"]["errors"], 0)
+                self.assertEqual(report["per_scenario"]["invalid"]["error_rate"], 1.0)
+                self.assertLessEqual(report["latency_ms"]["p50"], report["latency_ms"]["p99"])
+                json.dumps(report)
+
+    def test_truncated_responses_are_errors(self):
+        server = BionicReadingServer()
+        server.httpd.RequestHandlerClass = TruncatingHandler
+        with server:
+            report = LoadTest(server.url, self.scenarios, mode="closed", concurrency=2, duration=0.3).run()
+        self.assertGreater(report["requests"], 0)
+        self.assertEqual(report["error_rate"], 1.0)
+
+    def test_main_saves_json(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.json")
+            main(["--mode", "closed", "--concurrency", "1", "--duration", "0.3", "--seed", "1", "--output", output])
+            with open(output, "r") as file:
+                report = json.load(file)
+            self.assertEqual(report["errors"], 0)
+            self.assertTrue(report["version"])
+            self.assertEqual(datetime.fromisoformat(report["timestamp"]).utcoffset(), timedelta(0))
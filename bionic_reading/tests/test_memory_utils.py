@@ -0,0 +1,46 @@
+import unittest
+from unittest import mock
+
+from bionic_reading.features.bionic_reading import BionicReading
+from bionic_reading.utils.memory_utils import MemoryProfiler
+
+
+class TestMemory(unittest.TestCase):
+    text = "We are happy if as many people as possible can use the advantage of Bionic Reading.\n" * 200
+
+    def test_profiler_report(self):
+        profiler = MemoryProfiler()
+        BionicReading().read_faster(text=self.text, profiler=profiler)
+        self.assertEqual([stage.stage for stage in profiler.stages], ["count", "tokenize", "highlight", "join", "wrap"])
+        self.assertTrue(all(stage.peak >= 0 for stage in profiler.stages))
+        self.assertGreater(profiler.peak, 0)
+        self.assertIn("highlight", profiler.report())
+
+    def test_profiler_without_reset_peak(self):
+        profiler = MemoryProfiler()
+        with mock.patch("bionic_reading.utils.memory_utils.HAS_RESET_PEAK", False):
+            BionicReading().read_faster(text=self.text, profiler=profiler)
+        self.assertEqual(len(profiler.stages), 5)
+        self.assertTrue(all(stage.peak >= stage.retained >= 0 for stage in profiler.stages))
+
+    def test_budget_depends_on_output_format(self):
+        max_memory = 45 * len(self.text)
+        self.assertFalse(BionicReading(output_format="html", max_memory=max_memory).exceeds_memory(self.text))
+        self.assertTrue(BionicReading(output_format="spans", max_memory=max_memory).exceeds_memory(self.text))
+
+    def test_max_memory_same_output(self):
+        for output_format in ("html", "python", "spans"):
+            bionic_reading = BionicReading(output_format=output_format, rare_words_max_freq=200)
+            expected = bionic_reading.read_faster(text=self.text)
+            bionic_reading.max_memory = 1024
+            self.assertTrue(bionic_reading.exceeds_memory(self.text))
+            self.assertEqual(bionic_reading.read_faster(text=self.text), expected)
+
+    def test_chunked_rare_words(self):
+        bionic_reading = BionicReading(rare_words_max_freq=200)
+        self.assertEqual(
+            bionic_reading.get_rare_words_chunked(self.text, chunk_size=100), bionic_reading.get_rare_words(self.text)
+        )
+        self.assertEqual(
+            list(bionic_reading.iter_text_to_words(self.text)), bionic_reading.split_text_to_words(self.text)
+        )
@@ -0,0 +1,79 @@
+import time
+import random
+import unittest
+
+from typing import List
+
+from bionic_reading.features.bionic_reading import BionicReading
+from bionic_reading.features.frequency_sketch import CountMinSketch
+from bionic_reading.features.pipeline import BionicReadingPipeline
+
+
+class TestBionicReadingPipeline(unittest.TestCase):
+    chunks = ["We are happy if as many people as possible can use the advantage of Bionic Reading."] * 50
+
+    def test_same_output_as_read_faster(self):
+        text = "".join(self.chunks)
+        for output_format in ("html", "python", "spans"):
+            bionic_reading = BionicReading(output_format=output_format, rare_words_max_freq=10)
+            output = []
+            metrics = BionicReadingPipeline(bionic_reading, sketch=CountMinSketch(1024, 4)).run([text], output.append)
+            expected = bionic_reading.read_faster(text)
+            self.assertEqual("".join(output), expected + "\n" if output_format == "spans" else expected)
+            self.assertEqual(metrics["write"].items, 1)
+
+    def test_same_output_whatever_the_chunking(self):
+        text = "".join(self.chunks)
+        random_cuts = sorted(random.Random(0).sample(range(1, len(text)), 200))
+        chunkings = [
+            [text[index : index + 16] for index in range(0, len(text), 16)],
+            [text[start:end] for start, end in zip([0] + random_cuts, random_cuts + [len(text)])],
+        ]
+        for output_format in ("html", "python"):
+            bionic_reading = BionicReading(output_format=output_format, rare_words_max_freq=0)
+            expected = []
+            BionicReadingPipeline(bionic_reading, sketch=CountMinSketch(1024, 4)).run([text], expected.append)
+            for chunks in chunkings:
+                output = []
+                BionicReadingPipeline(bionic_reading, sketch=CountMinSketch(1024, 4)).run(chunks, output.append)
+                self.assertEqual("".join(output), "".join(expected))
+            self.assertEqual("".join(output).count("<!DOCTYPE html>"), output_format == "html")
+
+    def test_runs_are_independent(self):
+        pipeline = BionicReadingPipeline(BionicReading(output_format="python", rare_words_max_freq=1))
+        first: List[str] = []
+        second: List[str] = []
+        pipeline.run(self.chunks, first.append)
+        pipeline.run(self.chunks, second.append)
+        self.assertEqual(first, second)
+
+    def test_backpressure(self):
+        def slow_write(_):
+            time.sleep(0.005)
+
+        pipeline = BionicReadingPipeline(BionicReading(), queue_size=2)
+        metrics = pipeline.run(self.chunks, slow_write)
+        self.assertTrue(all(stage.max_queue_depth <= 2 for stage in metrics.values()))
+        self.assertEqual(metrics["write"].max_queue_depth, 2)
+        self.assertIn("classify", pipeline.report())
+
+    def test_errors_are_raised(self):
+        def broken_source():
+            yield self.chunks[0]
+            raise IOError("connection lost")
+
+        with self.assertRaises(IOError):
+            BionicReadingPipeline(BionicReading()).run(broken_source(), lambda _: None)
+        with self.assertRaises(ValueError):
+            BionicReadingPipeline(BionicReading()).run(self.chunks, lambda _: int("not a number"))
+
+    def test_error_does_not_wait_for_the_source(self):
+        def slow_source():
+            yield self.chunks[0]
+            time.sleep(3)
+            yield self.chunks[0]
+
+        started = time.perf_counter()
+        with self.assertRaises(ValueError):
+            BionicReadingPipeline(BionicReading()).run(slow_source(), lambda _: int("not a number"))
+        self.assertLess(time.perf_counter() - started, 1.5)
@@ -0,0 +1,45 @@
+import json
+import unittest
+
+from bionic_reading.features.bionic_reading import BionicReading
+from bionic_reading.utils.span_utils import Span, spans_from_bytes, spans_from_json, spans_to_bytes, spans_to_json
+
+
+class TestSpanUtils(unittest.TestCase):
+    text = "We are happy people reading. " * 20
+
+    def test_json(self):
+        spans = [Span(0, 1, "bold"), Span(3, 8, "underline"), Span(10, 12, "remove")]
+        data = json.loads(spans_to_json("We are happy", spans))
+        self.assertEqual(data["offsets"], "utf16")
+        self.assertEqual(data["spans"], [0, 1, 0, 2, 5, 2, 2, 2, 4])
+        self.assertEqual(spans_from_json(spans_to_json("We are happy", spans)), ("We are happy", spans))
+
+    def test_bytes_round_trip(self):
+        text = "a" * 70010
+        spans = [Span(0, 1, "bold"), Span(3, 8, "highlight"), Span(70000, 70004, "strikethrough")]
+        data = spans_to_bytes(text, spans)
+        self.assertEqual(len(data), 3 + 3 + 5)
+        self.assertEqual(spans_from_bytes(text, data), spans)
+
+    def test_utf16_offsets(self):
+        text = "\U0001f44d café naïve"
+        bionic_reading = BionicReading(output_format="spans")
+        _, spans = bionic_reading.annotate(text)
+        data = json.loads(bionic_reading.read_faster(text=text))
+        units = text.encode("utf-16-le")
+        start = 0
+        for (gap, length, code), span in zip(zip(*[iter(data["spans"])] * 3), spans):
+            start += gap
+            self.assertEqual(units[2 * start : 2 * (start + length)].decode("utf-16-le"), text[span.start : span.end])
+            start += length
+        self.assertEqual(spans_from_json(bionic_reading.read_faster(text=text)), (text, spans))
+        self.assertEqual(spans_from_bytes(text, spans_to_bytes(text, spans)), spans)
+
+    def test_smaller_than_html(self):
+        html = BionicReading(output_format="html").read_faster(text=self.text).encode("utf-8")
+        bionic_reading = BionicReading(output_format="spans")
+        payload = bionic_reading.read_faster(text=self.text).encode("utf-8")
+        _, spans = bionic_reading.annotate(self.text)
+        self.assertLess(len(payload), len(html))
+        self.assertLess(len(self.text.encode("utf-8")) + len(spans_to_bytes(self.text, spans)), len(html))
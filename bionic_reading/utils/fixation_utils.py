@@ -0,0 +1,112 @@
+import re
+import unicodedata
+
+from typing import List
+from functools import lru_cache
+
+from bionic_reading.settings import FIXATION_CACHE_SIZE, FixationMode
+
+VOWELS_PATTERN = re.compile("[aeiouyàâäáãåæéèêëíìîïóòôöõøœúùûüý]+")
+ZERO_WIDTH_JOINER = "\u200d"
+
+
+def is_grapheme_extender(char: str) -> bool:
+    """
+    It returns True if the char extends the previous one (combining mark, variation selector, emoji skin tone, tag)
+
+    :param char: The char to check
+    :type char: str
+    :return: True or False
+    """
+    code = ord(char)
+    return (
+        unicodedata.category(char) in ("Mn", "Me", "Mc")
+        or 0xFE00 <= code <= 0xFE0F
+        or 0x1F3FB <= code <= 0x1F3FF
+        or 0xE0020 <= code <= 0xE007F
+    )
+
+
+def is_regional_indicator(char: str) -> bool:
+    """
+    It returns True if the char is a regional indicator (the flags are made of two of them)
+
+    :param char: The char to check
+    :type char: str
+    :return: True or False
+    """
+    return 0x1F1E6 <= ord(char) <= 0x1F1FF
+
+
+def grapheme_boundaries(token: str) -> List[int]:
+    """
+    It splits the token into user-perceived characters (base char + combining marks, emoji sequences, flags) and returns
+    the end offset of each of them
+
+    :param token: The token to split
+    :type token: str
+    :return: A list of increasing offsets, the last one is len(token).
+    """
+    boundaries = []
+    index = 0
+    while index < len(token):
+        char = token[index]
+        index += 1
+        if is_regional_indicator(char) and index < len(token) and is_regional_indicator(token[index]):
+            index += 1
+        while index < len(token):
+            if is_grapheme_extender(token[index]):
+                index += 1
+            elif token[index] == ZERO_WIDTH_JOINER:
+                index = min(index + 2, len(token))
+            else:
+                break
+        boundaries.append(index)
+
+    return boundaries
+
+
+def syllable_boundaries(token: str) -> List[int]:
+    """
+    It approximates the syllables of the token from its groups of vowels: one consonant between two groups starts the
+    next syllable (rea-ding, a-re), two or more consonants are split after the first one (hap-py, peop-le)
+
+    :param token: The token to split
+    :type token: str
+    :return: A list of increasing offsets, the last one is len(token).
+    """
+    vowels = list(VOWELS_PATTERN.finditer(token.lower()))
+    boundaries = []
+    for current, following in zip(vowels, vowels[1:]):
+        consonants = following.start() - current.end()
+        boundaries.append(current.end() if consonants <= 1 else current.end() + 1)
+
+    return boundaries + [len(token)]
+
+
+@lru_cache(maxsize=FIXATION_CACHE_SIZE)
+def fixation_split(token: str, fixation: float, fixation_mode: str) -> int:
+    """
+    It returns the number of chars of the token to highlight, the split never breaks a grapheme. In syllables mode, the
+    split is the syllable boundary the closest to the graphemes split
+
+    :param token: The token to split
+    :type token: str
+    :param fixation: The share of the token to highlight
+    :type fixation: float
+    :param fixation_mode: How the token is split (graphemes, syllables)
+    :type fixation_mode: str
+    :return: The offset of the split.
+    """
+    graphemes = grapheme_boundaries(token)
+    if not graphemes:
+        return 0
+    count = len(graphemes)
+    keep = 1 if count <= 2 else round(fixation * count)
+    split = graphemes[keep - 1] if keep > 0 else 0
+    if fixation_mode == FixationMode.SYLLABLES.value:
+        candidates = set(graphemes[:-1]).intersection(syllable_boundaries(token))
+        if candidates:
+            split = min(sorted(candidates), key=lambda boundary: abs(boundary - split))
+
+    return split
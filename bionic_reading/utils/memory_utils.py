@@ -0,0 +1,84 @@
+import tracemalloc
+
+from contextlib import contextmanager
+from typing import Iterator, List, NamedTuple
+
+# tracemalloc.reset_peak only exists since python 3.9
+HAS_RESET_PEAK = hasattr(tracemalloc, "reset_peak")
+
+
+class StageMemory(NamedTuple):
+    stage: str
+    peak: int
+    retained: int
+
+
+class MemoryProfiler:
+    """Measure with tracemalloc the peak and retained memory of each stage of a run."""
+
+    def __init__(self, enabled: bool = True):
+        """
+        Inits MemoryProfiler
+
+        :param enabled: If False, the stages are not measured (no overhead)
+        :type enabled: bool
+        """
+        self.enabled = enabled
+        self.stages: List[StageMemory] = []
+        self._started = False
+
+    def __enter__(self) -> "MemoryProfiler":
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started = True
+
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        It measures the memory allocated during the stage, relative to the memory traced when the stage starts. Before
+        python 3.9, if the tracing was not started by the profiler, the peak can't be reset and may be overestimated
+
+        :param name: The name of the stage
+        :type name: str
+        """
+        if not self.enabled:
+            yield
+            return
+        assert tracemalloc.is_tracing(), "please use the profiler as a context manager to trace the memory"
+        if HAS_RESET_PEAK:
+            tracemalloc.reset_peak()
+        elif self._started:
+            # restarting clears the peak, the memory allocated before the stage is not traced anymore
+            tracemalloc.stop()
+            tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            self.stages.append(StageMemory(name, peak - before, current - before))
+
+    @property
+    def peak(self) -> int:
+        """
+        It returns the highest peak among all the stages
+        :return: The peak in bytes.
+        """
+        return max((stage.peak for stage in self.stages), default=0)
+
+    def report(self) -> str:
+        """
+        It formats the measures as a table, one line per stage
+        :return: The report.
+        """
+        lines = [f"{'stage':<12}{'peak (bytes)':>16}{'retained (bytes)':>20}"]
+        lines += [f"{stage.stage:<12}{stage.peak:>16,}{stage.retained:>20,}" for stage in self.stages]
+
+        return "\n".join(lines)
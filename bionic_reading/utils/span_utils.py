@@ -0,0 +1,165 @@
+import io
+import re
+import json
+
+from typing import Iterable, Iterator, List, NamedTuple, Tuple
+
+from bionic_reading.settings import SPAN_STYLES
+
+# chars outside of the basic multilingual plane take 2 UTF-16 code units
+ASTRAL_PATTERN = re.compile("[\U00010000-\U0010ffff]")
+SPAN_OFFSETS = "utf16"
+
+
+class Span(NamedTuple):
+    start: int
+    end: int
+    style: str
+
+
+def utf16_length(text: str) -> int:
+    """
+    It returns the length of the text in UTF-16 code units, the unit used to index strings in JS, Kotlin and Swift
+
+    :param text: The text to measure
+    :type text: str
+    :return: The number of UTF-16 code units.
+    """
+    return len(text) + len(ASTRAL_PATTERN.findall(text))
+
+
+def iter_span_deltas(text: str, spans: Iterable[Span]) -> Iterator[Tuple[int, int, int]]:
+    """
+    It encodes each annotation relatively to the previous one, as (gap since the end of the previous annotation,
+    length, style code), gap and length are counted in UTF-16 code units
+
+    :param text: The original text, the annotations offsets are python string indices
+    :type text: str
+    :param spans: The annotations, sorted and not overlapping
+    :type spans: Iterable[Span]
+    :return: An iterator of (gap, length, style code).
+    """
+    codes = {style: code for code, style in enumerate(SPAN_STYLES)}
+    astral = ASTRAL_PATTERN.search(text) is not None
+    previous = 0
+    for span in spans:
+        if astral:
+            gap, length = utf16_length(text[previous : span.start]), utf16_length(text[span.start : span.end])
+        else:
+            gap, length = span.start - previous, span.end - span.start
+        yield gap, length, codes[span.style]
+        previous = span.end
+
+
+def spans_from_deltas(text: str, deltas: Iterable[Tuple[int, int, int]]) -> List[Span]:
+    """
+    It decodes the (gap, length, style code) made by `iter_span_deltas` back into annotations with python string indices
+
+    :param text: The original text
+    :type text: str
+    :param deltas: The (gap, length, style code) of each annotation, in UTF-16 code units
+    :type deltas: Iterable[Tuple[int, int, int]]
+    :return: A list of annotations.
+    """
+    astral = ASTRAL_PATTERN.search(text) is not None
+    spans = []
+    index = 0
+
+    def advance(start: int, units: int) -> int:
+        while units > 0:
+            units -= 2 if ord(text[start]) > 0xFFFF else 1
+            start += 1
+        return start
+
+    for gap, length, code in deltas:
+        start = index + gap if not astral else advance(index, gap)
+        index = start + length if not astral else advance(start, length)
+        spans.append(Span(start, index, SPAN_STYLES[code]))
+
+    return spans
+
+
+def spans_to_json(text: str, spans: Iterable[Span]) -> str:
+    """
+    It serializes the original text and its annotations into a compact json string. The annotations are a flat list of
+    (gap, length, style code) in UTF-16 code units, see `iter_span_deltas`, the legend of the codes is given by the
+    `styles` key. The annotations are written one by one, so they can be generated lazily
+
+    :param text: The original text
+    :type text: str
+    :param spans: The annotations
+    :type spans: Iterable[Span]
+    :return: A json string with the keys text, offsets, styles and spans.
+    """
+    buffer = io.StringIO()
+    buffer.write('{"text":')
+    buffer.write(json.dumps(text, ensure_ascii=False))
+    buffer.write(f',"offsets":"{SPAN_OFFSETS}","styles":')
+    buffer.write(json.dumps(SPAN_STYLES, separators=(",", ":")))
+    buffer.write(',"spans":[')
+    for index, (gap, length, code) in enumerate(iter_span_deltas(text, spans)):
+        buffer.write(f"{',' if index else ''}{gap},{length},{code}")
+    buffer.write("]}")
+
+    return buffer.getvalue()
+
+
+def spans_from_json(payload: str) -> Tuple[str, List[Span]]:
+    """
+    It decodes a json string made by `spans_to_json`
+
+    :param payload: The json string
+    :type payload: str
+    :return: The original text and its annotations.
+    """
+    data = json.loads(payload)
+    assert data["offsets"] == SPAN_OFFSETS, f"please use {SPAN_OFFSETS} offsets"
+    values = data["spans"]
+    deltas = zip(values[0::3], values[1::3], values[2::3])
+
+    return data["text"], spans_from_deltas(data["text"], deltas)
+
+
+def spans_to_bytes(text: str, spans: Iterable[Span]) -> bytes:
+    """
+    It packs the annotations into unsigned LEB128 varints, 3 per annotation (gap, length, style code) in UTF-16 code
+    units, most annotations take 3 bytes
+
+    :param text: The original text
+    :type text: str
+    :param spans: The annotations
+    :type spans: Iterable[Span]
+    :return: The packed annotations.
+    """
+    buffer = bytearray()
+    for delta in iter_span_deltas(text, spans):
+        for value in delta:
+            while value >= 0x80:
+                buffer.append(value & 0x7F | 0x80)
+                value >>= 7
+            buffer.append(value)
+
+    return bytes(buffer)
+
+
+def spans_from_bytes(text: str, data: bytes) -> List[Span]:
+    """
+    It unpacks the varints made by `spans_to_bytes` back into a list of annotations
+
+    :param text: The original text
+    :type text: str
+    :param data: The packed annotations
+    :type data: bytes
+    :return: A list of annotations.
+    """
+    values = []
+    value, shift = 0, 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            values.append(value)
+            value, shift = 0, 0
+    assert shift == 0 and len(values) % 3 == 0, "please use a buffer made by spans_to_bytes"
+
+    return spans_from_deltas(text, zip(values[0::3], values[1::3], values[2::3]))